@@ -1,22 +1,123 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import contextlib
+import hashlib
+import html
 import json
 import os
 import logging
-from urllib.parse import parse_qs, urlparse
-from typing import Any, Dict, List
+import re
+import sys
+import time
+from urllib.parse import unquote
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
-from bs4 import BeautifulSoup
 from crawl4ai import AsyncWebCrawler
 
+try:
+    import h2  # noqa: F401
+
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+try:
+    import uvloop
+
+    _LOOP_FACTORY = uvloop.new_event_loop
+except ImportError:
+    _LOOP_FACTORY = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from diskcache import Cache
+except ImportError:
+    Cache = None
+
 DUCKDUCKGO_HTML_URL = "https://html.duckduckgo.com/html/"
 MAX_RESULTS = 3
 OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://localhost:11434/api/generate")
 OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "qwen2.5:latest")
-SUMMARY_MAX_CHARS = 6000
+try:
+    OLLAMA_CONCURRENCY = max(1, int(os.environ.get("OLLAMA_CONCURRENCY", "2")))
+except ValueError:
+    OLLAMA_CONCURRENCY = 2
+OLLAMA_TIMEOUT = 60
+# Large enough for a full batch prompt (3 x SUMMARY_MAX_CHARS plus
+# instructions) and its answers; Ollama otherwise truncates the prompt head.
+OLLAMA_NUM_CTX = 8192
+SUMMARY_MAX_CHARS = 3000
+SUMMARY_WINDOW_CHARS = 1000
+SUMMARY_WINDOW_OVERLAP = 200
+FACTS_MAX_WORDS = 120
+FACTS_MAX_TOKENS = 200
+MIN_CONTENT_CHARS = 200
+CACHE_DIR = os.environ.get(
+    "SEARCH_WEB_CACHE_DIR", os.path.expanduser("~/.cache/search_web_mcp")
+)
+FACTS_CACHE_TTL = 24 * 60 * 60
+MODEL_CHECK_FILE = os.path.join(CACHE_DIR, "model.json")
+MODEL_CHECK_TTL = 300
+DDG_CACHE_TTL = 60
 _MODEL_CHECK = {"checked": False, "available": True, "error": None}
+_CLIENT: Optional[httpx.AsyncClient] = None
+_CRAWLER: Optional[AsyncWebCrawler] = None
+_CRAWLER_LOCK = asyncio.Lock()
+_RUNNER: Optional[asyncio.Runner] = None
+_FACTS_CACHE: Any = None
+_MISSING = object()
+_OLLAMA_SEMAPHORE = asyncio.Semaphore(OLLAMA_CONCURRENCY)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_DDG_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    )
+}
+_FACTS_PROMPT = (
+    "Answer the user query using only concrete facts found in the page. "
+    "Do not include generic site descriptions or boilerplate. Ignore navigation, "
+    "menus, legal, and layout. If key facts are missing, say 'not found'. "
+    "Keep the answer under {max_words} words.\n\n"
+    "User query: {query}\n\n"
+    "Page content:\n{snippet}"
+)
+_BATCH_FACTS_PROMPT = (
+    "Answer the user query separately for each of the {count} documents below, "
+    "using only concrete facts found in that document. Do not include generic "
+    "site descriptions or boilerplate. Ignore navigation, menus, legal, and "
+    "layout. If key facts are missing from a document, say 'not found' for it. "
+    "Give the answers in document order, separated by a line containing only "
+    "'---', without repeating the document labels. Keep each answer under "
+    "{max_words} words.\n\n"
+    "User query: {query}\n\n"
+    "{documents}"
+)
+_BATCH_SEPARATOR_RE = re.compile(r"^\s*---\s*$", re.MULTILINE)
+_SENTENCE_END_RE = re.compile(r"[.!?](?=\s|$)")
+_RESULT_RE = re.compile(
+    r'<a[^>]*class="result__a"[^>]*href="([^"]+)"[^>]*>(.*?)</a>'
+    r'(?:(?:(?!class="result__a").)*?'
+    r'<a[^>]*class="result__snippet"[^>]*>(.*?)</a>)?',
+    re.DOTALL,
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"\w+")
+_DDG_PREFIXES = (
+    "https://duckduckgo.com/",
+    "http://duckduckgo.com/",
+    "https://html.duckduckgo.com/",
+    "http://html.duckduckgo.com/",
+)
+_DDG_REDIRECT_PREFIXES = tuple(f"{prefix}l/?" for prefix in _DDG_PREFIXES)
 
 
 logging.basicConfig(level=logging.WARNING)
@@ -24,21 +125,186 @@ logging.getLogger("crawl4ai").setLevel(logging.WARNING)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
 
+def loads_json(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def html_to_text(fragment: str) -> str:
+    return " ".join(html.unescape(_TAG_RE.sub(" ", fragment)).split())
+
+
+def get_client() -> httpx.AsyncClient:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.AsyncClient(
+            timeout=60,
+            http2=_HTTP2,
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+        )
+    return _CLIENT
+
+
+async def close_client() -> None:
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+async def get_crawler() -> AsyncWebCrawler:
+    global _CRAWLER
+    async with _CRAWLER_LOCK:
+        if _CRAWLER is None:
+            crawler = AsyncWebCrawler()
+            try:
+                await crawler.start()
+            except BaseException:
+                # Start-up is cancelled when the DuckDuckGo fetch fails; don't
+                # leave a half-launched browser behind.
+                with contextlib.suppress(Exception):
+                    await asyncio.shield(crawler.close())
+                raise
+            _CRAWLER = crawler
+    return _CRAWLER
+
+
+async def close_crawler() -> None:
+    global _CRAWLER
+    if _CRAWLER is not None:
+        crawler, _CRAWLER = _CRAWLER, None
+        await crawler.close()
+
+
+async def close_resources() -> None:
+    await close_crawler()
+    await close_client()
+
+
+def get_runner() -> asyncio.Runner:
+    # The shared client and browser are bound to the event loop that created
+    # them, so all handle_request calls in a process share one loop. main()
+    # serves a single query per process; the browser is only reused by hosts
+    # that import handle_request and call it more than once.
+    global _RUNNER
+    if _RUNNER is None:
+        _RUNNER = asyncio.Runner(loop_factory=_LOOP_FACTORY)
+        atexit.register(close_runner)
+    return _RUNNER
+
+
+def close_runner() -> None:
+    global _RUNNER
+    if _RUNNER is not None:
+        runner, _RUNNER = _RUNNER, None
+        try:
+            runner.run(close_resources())
+        finally:
+            runner.close()
+
+
+def get_facts_cache() -> Any:
+    global _FACTS_CACHE
+    if _FACTS_CACHE is None and Cache is not None:
+        _FACTS_CACHE = Cache(CACHE_DIR)
+    return _FACTS_CACHE
+
+
+def facts_cache_key(snippet: str, query: str) -> str:
+    content_hash = hashlib.blake2b(snippet.encode()).hexdigest()
+    return hashlib.blake2b(
+        f"{OLLAMA_MODEL}|{query}|{content_hash}".encode()
+    ).hexdigest()
+
+
+def select_relevant_text(content: str, query: str) -> str:
+    if len(content) <= SUMMARY_MAX_CHARS:
+        return content
+    terms = {term for term in _WORD_RE.findall(query.lower()) if len(term) > 2}
+    lowered = content.lower()
+    step = SUMMARY_WINDOW_CHARS - SUMMARY_WINDOW_OVERLAP
+    scored = []
+    for start in range(0, len(content) - SUMMARY_WINDOW_OVERLAP, step):
+        # Keep the last window full-size rather than a short tail.
+        start = min(start, len(content) - SUMMARY_WINDOW_CHARS)
+        end = start + SUMMARY_WINDOW_CHARS
+        scored.append((sum(lowered.count(term, start, end) for term in terms), start))
+    if not any(score for score, _ in scored):
+        return content[:SUMMARY_MAX_CHARS]
+    # Spend the whole budget: windows without a hit still fill the remaining
+    # slots, earliest first, since the sort is stable.
+    ranked = [start for _, start in sorted(scored, key=lambda pair: -pair[0])]
+    spans: List[List[int]] = []
+    for start in sorted(ranked[: SUMMARY_MAX_CHARS // SUMMARY_WINDOW_CHARS]):
+        end = start + SUMMARY_WINDOW_CHARS
+        if spans and start <= spans[-1][1]:
+            spans[-1][1] = end
+        else:
+            spans.append([start, end])
+    return "\n...\n".join(content[start:end] for start, end in spans)
+
+
 def get_ollama_base_url() -> str:
     if "/api/" in OLLAMA_URL:
         return OLLAMA_URL.split("/api/", 1)[0]
     return OLLAMA_URL.rstrip("/")
 
 
+def load_model_check() -> bool:
+    try:
+        with open(MODEL_CHECK_FILE, "rb") as handle:
+            saved = loads_json(handle.read())
+    except (OSError, ValueError):
+        return False
+    if not isinstance(saved, dict):
+        return False
+    saved_at = saved.get("ts")
+    if (
+        saved.get("model") != OLLAMA_MODEL
+        or saved.get("url") != get_ollama_base_url()
+        or not saved.get("available")
+        or not isinstance(saved_at, (int, float))
+        or time.time() - saved_at >= MODEL_CHECK_TTL
+    ):
+        return False
+    _MODEL_CHECK.update({"checked": True, "available": True, "error": None})
+    return True
+
+
+def save_model_check() -> None:
+    try:
+        os.makedirs(os.path.dirname(MODEL_CHECK_FILE), exist_ok=True)
+        saved = {
+            "ts": time.time(),
+            "available": True,
+            "model": OLLAMA_MODEL,
+            "url": get_ollama_base_url(),
+        }
+        with open(MODEL_CHECK_FILE, "wb") as handle:
+            handle.write(dumps_json(saved))
+    except OSError:
+        pass
+
+
 async def ensure_model_available() -> Dict[str, Any]:
     if _MODEL_CHECK["checked"]:
         return _MODEL_CHECK
+    # Only positive probes are persisted: a recently seen model is assumed to
+    # still be there, and a failed generation surfaces as facts_error anyway.
+    if load_model_check():
+        return _MODEL_CHECK
     base_url = get_ollama_base_url()
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(f"{base_url}/api/tags")
-            response.raise_for_status()
-            data = response.json()
+        response = await get_client().get(f"{base_url}/api/tags", timeout=10)
+        response.raise_for_status()
+        data = loads_json(response.content)
         models = [m.get("name") for m in data.get("models", [])]
         if OLLAMA_MODEL not in models:
             _MODEL_CHECK.update(
@@ -50,113 +316,261 @@ async def ensure_model_available() -> Dict[str, Any]:
             )
             return _MODEL_CHECK
         _MODEL_CHECK.update({"checked": True, "available": True, "error": None})
+        save_model_check()
     except Exception as exc:
         _MODEL_CHECK.update({"checked": True, "available": False, "error": str(exc)})
     return _MODEL_CHECK
 
 
 async def fetch_duckduckgo_results(query: str, limit: int) -> List[Dict[str, str]]:
-    params = {"q": query}
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        )
-    }
-    async with httpx.AsyncClient(timeout=20) as client:
-        response = await client.get(DUCKDUCKGO_HTML_URL, params=params, headers=headers)
-        response.raise_for_status()
+    # Each query runs in a fresh process, so repeats are only caught by the
+    # on-disk cache shared with extracted facts.
+    cache = get_facts_cache()
+    cache_key = f"ddg|{limit}|{query}"
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+    response = await get_client().get(
+        DUCKDUCKGO_HTML_URL, params={"q": query}, headers=_DDG_HEADERS, timeout=20
+    )
+    response.raise_for_status()
 
-    soup = BeautifulSoup(response.text, "html.parser")
     results: List[Dict[str, str]] = []
-    for result in soup.select(".result"):
-        link = result.select_one(".result__a")
-        snippet = result.select_one(".result__snippet")
-        if not link or not link.get("href"):
-            continue
-        href = link["href"]
+    for match in _RESULT_RE.finditer(response.text):
+        raw_href, title, snippet = match.groups()
+        href = html.unescape(raw_href)
         if href.startswith("//"):
             href = f"https:{href}"
-        parsed = urlparse(href)
-        if parsed.netloc.endswith("duckduckgo.com") and parsed.path.startswith("/l/"):
-            uddg = parse_qs(parsed.query).get("uddg", [""])[0]
-            if uddg:
-                href = uddg
-                parsed = urlparse(href)
-        if parsed.netloc.endswith("duckduckgo.com"):
+        if href.startswith(_DDG_REDIRECT_PREFIXES):
+            start = href.find("uddg=")
+            if start != -1:
+                end = href.find("&", start)
+                uddg = unquote(href[start + 5 : end if end != -1 else None])
+                if uddg:
+                    href = uddg
+        host = href.split("/", 3)[2] if href.startswith(("https://", "http://")) else ""
+        if host.endswith("duckduckgo.com"):
             continue
         results.append(
             {
-                "title": link.get_text(strip=True),
+                "title": html_to_text(title),
                 "url": href,
-                "snippet": snippet.get_text(" ", strip=True) if snippet else "",
+                "snippet": html_to_text(snippet) if snippet else "",
             }
         )
         if len(results) >= limit:
             break
+    # An empty page is usually DuckDuckGo's bot challenge, served as 200; don't
+    # pin it for the whole TTL.
+    if cache is not None and results:
+        cache.set(cache_key, results, expire=DDG_CACHE_TTL)
     return results
 
 
-async def crawl_urls(urls: List[str]) -> List[Any]:
-    if not urls:
-        return []
-    async with AsyncWebCrawler() as crawler:
-        tasks = [crawler.arun(url=url) for url in urls]
-        return await asyncio.gather(*tasks, return_exceptions=True)
+async def crawl_url(crawler: AsyncWebCrawler, url: str) -> Any:
+    try:
+        return await crawler.arun(url=url)
+    except Exception as exc:
+        return exc
 
 
 def normalize_crawl_result(result: Any) -> Dict[str, Any]:
     if isinstance(result, Exception):
         return {"content": "", "error": str(result)}
-    content = ""
-    if hasattr(result, "markdown"):
-        content = result.markdown
-        if hasattr(result.markdown, "raw_markdown"):
-            content = result.markdown.raw_markdown or ""
-    elif hasattr(result, "text"):
-        content = result.text
-    return {"content": content}
-
-
-async def extract_facts(content: str, query: str) -> Dict[str, Any]:
-    if not content:
-        return {"facts": "", "facts_error": None}
+    markdown = getattr(result, "markdown", _MISSING)
+    if markdown is _MISSING:
+        return {"content": getattr(result, "text", "") or ""}
+    raw_markdown = getattr(markdown, "raw_markdown", _MISSING)
+    if raw_markdown is _MISSING:
+        return {"content": markdown or ""}
+    return {"content": raw_markdown or ""}
+
+
+def lookup_facts(
+    content: str, query: str
+) -> Tuple[Optional[Dict[str, Any]], str, str]:
+    content = content or ""
+    # Pages that crawl to a few bytes of navigation chrome only ever produce
+    # "not found", so skip the model call for them. Whitespace is collapsed
+    # for this check only; the prompt keeps the markdown structure.
+    if len(" ".join(content.split())) < MIN_CONTENT_CHARS:
+        return {"facts": "", "facts_error": None}, "", ""
+    snippet = select_relevant_text(content, query)
+    cache_key = facts_cache_key(snippet, query)
+    cache = get_facts_cache()
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return {"facts": cached, "facts_error": None}, snippet, cache_key
+    return None, snippet, cache_key
+
+
+def store_facts(cache_key: str, facts: str) -> None:
+    cache = get_facts_cache()
+    if cache is not None and facts:
+        cache.set(cache_key, facts, expire=FACTS_CACHE_TTL)
+
+
+async def extract_facts_batch(contents: List[str], query: str) -> List[Dict[str, Any]]:
+    facts_list: List[Optional[Dict[str, Any]]] = []
+    # Mirrored or redirected pages often yield identical snippets; send each
+    # distinct snippet once and share its answer between those pages.
+    pending: Dict[str, Tuple[str, List[int]]] = {}
+    for index, content in enumerate(contents):
+        resolved, snippet, cache_key = lookup_facts(content, query)
+        facts_list.append(resolved)
+        if resolved is None:
+            pending.setdefault(cache_key, (snippet, []))[1].append(index)
+    keys = list(pending)
+    generated: Dict[str, Dict[str, Any]] = {}
+    if len(keys) > 1:
+        batched = await generate_batch_facts([pending[key][0] for key in keys], query)
+        if batched is not None:
+            for key, facts in zip(keys, batched):
+                store_facts(key, facts.get("facts", ""))
+                generated[key] = facts
+            keys = []
+    # A single page, or a batch answer that was truncated or could not be
+    # split back into one answer per document, goes through the per-page path.
+    fallback = await asyncio.gather(
+        *(generate_facts(pending[key][0], query, key) for key in keys)
+    )
+    generated.update(zip(keys, fallback))
+    for key, facts in generated.items():
+        for index in pending[key][1]:
+            facts_list[index] = facts
+    return [facts or {"facts": "", "facts_error": None} for facts in facts_list]
+
+
+async def stream_generate(
+    prompt: str, max_tokens: int, timeout: Optional[float] = None
+) -> Tuple[str, bool]:
+    # Ollama runs generations for a model one (or a few) at a time; queue here
+    # rather than piling requests onto the server, and only start the clock
+    # once this call actually holds a slot.
+    timeout = timeout or OLLAMA_TIMEOUT
+    async with _OLLAMA_SEMAPHORE:
+        try:
+            async with asyncio.timeout(timeout):
+                return await read_generation(prompt, max_tokens)
+        except TimeoutError as exc:
+            raise RuntimeError(f"Ollama request timed out after {timeout}s") from exc
+
+
+async def read_generation(prompt: str, max_tokens: int) -> Tuple[str, bool]:
+    chunks: List[str] = []
+    done = False
+    async with get_client().stream(
+        "POST",
+        OLLAMA_URL,
+        content=dumps_json(
+            {
+                "model": OLLAMA_MODEL,
+                "prompt": prompt,
+                "stream": True,
+                "options": {"num_ctx": OLLAMA_NUM_CTX},
+            }
+        ),
+        headers=_JSON_HEADERS,
+        timeout=None,
+    ) as response:
+        response.raise_for_status()
+        # Ollama streams one JSON object per generated token; leaving the
+        # block early closes the connection and stops generation.
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            data = loads_json(line)
+            if data.get("error"):
+                raise RuntimeError(data["error"])
+            chunks.append(data.get("response", ""))
+            done = bool(data.get("done"))
+            if done or len(chunks) >= max_tokens:
+                break
+    text = "".join(chunks).strip()
+    if not done:
+        # Cut off at the token budget: drop the trailing partial sentence.
+        ends = list(_SENTENCE_END_RE.finditer(text))
+        if ends:
+            text = text[: ends[-1].end()]
+    return text, done
+
+
+async def generate_facts(snippet: str, query: str, cache_key: str) -> Dict[str, Any]:
     model_status = await ensure_model_available()
     if not model_status.get("available"):
         return {"facts": "", "facts_error": model_status.get("error")}
-    snippet = content[:SUMMARY_MAX_CHARS]
-    prompt = (
-        "Answer the user query using only concrete facts found in the page. "
-        "Do not include generic site descriptions or boilerplate. Ignore navigation, "
-        "menus, legal, and layout. If key facts are missing, say 'not found'.\n\n"
-        f"User query: {query}\n\n"
-        f"Page content:\n{snippet}"
+    prompt = _FACTS_PROMPT.format(
+        query=query, snippet=snippet, max_words=FACTS_MAX_WORDS
     )
     try:
-        async with httpx.AsyncClient(timeout=60) as client:
-            response = await client.post(
-                OLLAMA_URL,
-                json={"model": OLLAMA_MODEL, "prompt": prompt, "stream": False},
-            )
-            response.raise_for_status()
-            data = response.json()
-        facts = data.get("response", "").strip()
+        facts, done = await stream_generate(prompt, FACTS_MAX_TOKENS)
+        # Truncated answers are still returned but never cached.
+        if done:
+            store_facts(cache_key, facts)
         return {"facts": facts, "facts_error": None}
     except Exception as exc:
         return {"facts": "", "facts_error": str(exc)}
 
 
+async def generate_batch_facts(
+    snippets: List[str], query: str
+) -> Optional[List[Dict[str, Any]]]:
+    model_status = await ensure_model_available()
+    if not model_status.get("available"):
+        error = model_status.get("error")
+        return [{"facts": "", "facts_error": error} for _ in snippets]
+    documents = "\n\n".join(
+        f"DOCUMENT {index}:\n{snippet}" for index, snippet in enumerate(snippets, 1)
+    )
+    prompt = _BATCH_FACTS_PROMPT.format(
+        count=len(snippets),
+        query=query,
+        documents=documents,
+        max_words=FACTS_MAX_WORDS,
+    )
+    try:
+        text, done = await stream_generate(
+            prompt,
+            FACTS_MAX_TOKENS * len(snippets),
+            timeout=OLLAMA_TIMEOUT * len(snippets),
+        )
+    except Exception as exc:
+        # The batch already used OLLAMA_TIMEOUT per page; retrying each page
+        # would multiply the wait, so report the failure instead.
+        return [{"facts": "", "facts_error": str(exc)} for _ in snippets]
+    answers = [answer.strip() for answer in _BATCH_SEPARATOR_RE.split(text)]
+    # A batch cut off at the token budget leaves its last answer truncated;
+    # redo those pages individually rather than cache a partial answer.
+    if not done or len(answers) != len(snippets):
+        return None
+    return [{"facts": answer, "facts_error": None} for answer in answers]
+
+
 async def search_web(query: str, top_k: int) -> Dict[str, Any]:
     top_k = max(1, min(top_k, MAX_RESULTS))
-    results = await fetch_duckduckgo_results(query, top_k)
-    urls = [item["url"] for item in results]
-    crawl_results = await crawl_urls(urls)
+    try:
+        async with asyncio.TaskGroup() as tg:
+            # The model probe and browser start-up do not depend on the query, so
+            # run them while the DuckDuckGo round-trip is in flight.
+            model_task = tg.create_task(ensure_model_available())
+            crawler_task = tg.create_task(get_crawler())
+            results = await fetch_duckduckgo_results(query, top_k)
+            crawler = await crawler_task
+            crawl_results = await asyncio.gather(
+                *(crawl_url(crawler, item["url"]) for item in results)
+            )
 
-    payloads = [normalize_crawl_result(crawl) for crawl in crawl_results]
-    facts_list = await asyncio.gather(
-        *(extract_facts(payload.get("content", ""), query) for payload in payloads)
-    )
+            payloads = [normalize_crawl_result(crawl) for crawl in crawl_results]
+            await model_task
+            facts_list = await extract_facts_batch(
+                [payload.get("content", "") for payload in payloads], query
+            )
+    except* Exception as group:
+        # Surface e.g. a DuckDuckGo HTTP error as itself rather than as an
+        # ExceptionGroup from the TaskGroup.
+        raise group.exceptions[0] from None
 
     output: List[Dict[str, Any]] = []
     for item, payload, facts in zip(results, payloads, facts_list):
@@ -182,7 +596,7 @@ def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
         top_k = int(top_k)
     except (TypeError, ValueError):
         top_k = 5
-    return asyncio.run(search_web(str(query), top_k))
+    return get_runner().run(search_web(str(query), top_k))
 
 
 def main() -> None:
@@ -192,11 +606,12 @@ def main() -> None:
     except EOFError:
         raw = "{}"
     try:
-        request = json.loads(raw) if raw else {}
+        request = loads_json(raw) if raw else {}
     except json.JSONDecodeError:
         request = {}
     response = handle_request(request)
-    print(json.dumps(response))
+    sys.stdout.buffer.write(dumps_json(response) + b"\n")
+    sys.stdout.buffer.flush()
 
 
 if __name__ == "__main__":
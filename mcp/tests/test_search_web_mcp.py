@@ -1,3 +1,4 @@
+import asyncio
 import json
 from types import SimpleNamespace
 import sys
@@ -9,6 +10,11 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 import search_web_mcp
 
 
+@pytest.fixture(autouse=True)
+def no_disk_cache(monkeypatch):
+    monkeypatch.setattr(search_web_mcp, "get_facts_cache", lambda: None)
+
+
 class FakeResponse:
     def __init__(self, text: str, status_code: int = 200):
         self.text = text
@@ -24,14 +30,33 @@ class FakeAsyncClient:
         self._text = text
         self._status_code = status_code
 
-    async def __aenter__(self):
+    async def get(self, url, params=None, headers=None, timeout=None):
+        return FakeResponse(self._text, self._status_code)
+
+
+class FakeCrawler:
+    instances = 0
+
+    def __init__(self):
+        FakeCrawler.instances += 1
+        self.closed = False
+
+    async def start(self):
         return self
 
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
+    async def close(self):
+        self.closed = True
+
+    async def arun(self, url):
+        return SimpleNamespace(markdown=SimpleNamespace(raw_markdown=url))
 
-    async def get(self, url, params=None, headers=None):
-        return FakeResponse(self._text, self._status_code)
+
+PAGE_CONTENT = " ".join(["page content"] * 20)
+OTHER_PAGE_CONTENT = " ".join(["other page"] * 20)
+
+
+async def fake_model_check():
+    return {"checked": True, "available": True, "error": None}
 
 
 def make_ddg_html(entries):
@@ -59,11 +84,7 @@ async def test_fetch_duckduckgo_results_parses_and_unwraps_redirect(monkeypatch)
             )
         ]
     )
-    monkeypatch.setattr(
-        search_web_mcp.httpx,
-        "AsyncClient",
-        lambda timeout=20: FakeAsyncClient(html),
-    )
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: FakeAsyncClient(html))
 
     results = await search_web_mcp.fetch_duckduckgo_results("test", 3)
 
@@ -84,11 +105,7 @@ async def test_fetch_duckduckgo_results_limits(monkeypatch):
             ("Two", "https://example.com/2", "B"),
         ]
     )
-    monkeypatch.setattr(
-        search_web_mcp.httpx,
-        "AsyncClient",
-        lambda timeout=20: FakeAsyncClient(html),
-    )
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: FakeAsyncClient(html))
 
     results = await search_web_mcp.fetch_duckduckgo_results("test", 1)
 
@@ -103,11 +120,7 @@ async def test_fetch_duckduckgo_results_skips_ads(monkeypatch):
             ("Real", "https://example.com/real", "B"),
         ]
     )
-    monkeypatch.setattr(
-        search_web_mcp.httpx,
-        "AsyncClient",
-        lambda timeout=20: FakeAsyncClient(html),
-    )
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: FakeAsyncClient(html))
 
     results = await search_web_mcp.fetch_duckduckgo_results("test", 3)
 
@@ -130,13 +143,11 @@ async def test_fetch_duckduckgo_results_skips_duckduckgo_urls(monkeypatch):
                 "https://duckduckgo.com/y.js?ad_domain=example.com",
                 "B",
             ),
+            ("About", "https://www.duckduckgo.com/about", "C"),
+            ("Home", "https://duckduckgo.com", "D"),
         ]
     )
-    monkeypatch.setattr(
-        search_web_mcp.httpx,
-        "AsyncClient",
-        lambda timeout=20: FakeAsyncClient(html),
-    )
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: FakeAsyncClient(html))
 
     results = await search_web_mcp.fetch_duckduckgo_results("test", 3)
 
@@ -145,6 +156,60 @@ async def test_fetch_duckduckgo_results_skips_duckduckgo_urls(monkeypatch):
     ]
 
 
+@pytest.mark.asyncio
+async def test_fetch_duckduckgo_results_unescapes_and_handles_missing_snippet(
+    monkeypatch,
+):
+    html = (
+        '<div class="result"><a class="result__a" '
+        'href="//duckduckgo.com/l/?uddg=https%3A%2F%2Fexample.com%2Fa&amp;rut=x">'
+        "A <b>&amp;</b> B</a></div>"
+        '<div class="result"><a class="result__a" href="https://example.com/b">B</a>'
+        '<a class="result__snippet">Some <b>bold</b>  text</a></div>'
+    )
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: FakeAsyncClient(html))
+
+    results = await search_web_mcp.fetch_duckduckgo_results("test", 3)
+
+    assert results == [
+        {"title": "A & B", "url": "https://example.com/a", "snippet": ""},
+        {"title": "B", "url": "https://example.com/b", "snippet": "Some bold text"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fetch_duckduckgo_results_reuses_cached_results(monkeypatch):
+    html = make_ddg_html([("One", "https://example.com/1", "A")])
+    requests = []
+
+    def fake_get_client():
+        requests.append(1)
+        return FakeAsyncClient(html)
+
+    cache = FakeCache()
+    monkeypatch.setattr(search_web_mcp, "get_facts_cache", lambda: cache)
+    monkeypatch.setattr(search_web_mcp, "get_client", fake_get_client)
+
+    first = await search_web_mcp.fetch_duckduckgo_results("test", 3)
+    second = await search_web_mcp.fetch_duckduckgo_results("test", 3)
+    await search_web_mcp.fetch_duckduckgo_results("test", 1)
+
+    assert first == second
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_duckduckgo_results_does_not_cache_empty_results(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(search_web_mcp, "get_facts_cache", lambda: cache)
+    monkeypatch.setattr(
+        search_web_mcp, "get_client", lambda: FakeAsyncClient("<html></html>")
+    )
+
+    assert await search_web_mcp.fetch_duckduckgo_results("test", 3) == []
+    assert cache == {}
+
+
 def test_normalize_crawl_result_with_markdown_raw():
     result = SimpleNamespace(
         markdown=SimpleNamespace(raw_markdown="raw", fit_markdown="fit")
@@ -157,6 +222,15 @@ def test_normalize_crawl_result_with_text():
     assert search_web_mcp.normalize_crawl_result(result) == {"content": "hello"}
 
 
+def test_normalize_crawl_result_with_plain_markdown():
+    result = SimpleNamespace(markdown="plain")
+    assert search_web_mcp.normalize_crawl_result(result) == {"content": "plain"}
+
+
+def test_normalize_crawl_result_without_content():
+    assert search_web_mcp.normalize_crawl_result(object()) == {"content": ""}
+
+
 def test_normalize_crawl_result_with_exception():
     error = ValueError("boom")
     assert search_web_mcp.normalize_crawl_result(error) == {
@@ -165,12 +239,309 @@ def test_normalize_crawl_result_with_exception():
     }
 
 
+def test_select_relevant_text_keeps_short_content():
+    assert search_web_mcp.select_relevant_text("short page", "query") == "short page"
+
+
+def test_select_relevant_text_prefers_windows_with_query_terms():
+    content = "a" * 5000 + " kettle boiling point " + "b" * 5000
+
+    snippet = search_web_mcp.select_relevant_text(content, "Kettle boiling")
+
+    assert "kettle boiling point" in snippet
+    assert len(snippet) <= search_web_mcp.SUMMARY_MAX_CHARS + 10
+    assert "b" * search_web_mcp.SUMMARY_WINDOW_CHARS not in snippet
+
+
+def test_select_relevant_text_fills_budget_around_single_hit():
+    content = "ab " * 2000 + "python"
+
+    snippet = search_web_mcp.select_relevant_text(content, "python")
+
+    assert snippet.endswith("python")
+    assert len(snippet) >= search_web_mcp.SUMMARY_MAX_CHARS - 300
+
+
+def test_select_relevant_text_falls_back_to_leading_windows():
+    content = "".join(chr(ord("a") + i % 26) * 100 for i in range(100))
+
+    snippet = search_web_mcp.select_relevant_text(content, "unrelated words")
+
+    assert snippet == content[: search_web_mcp.SUMMARY_MAX_CHARS]
+
+
+class FakeStreamResponse:
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.lines_read = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    def raise_for_status(self) -> None:
+        return None
+
+    async def aiter_lines(self):
+        for index, chunk in enumerate(self._chunks):
+            self.lines_read += 1
+            done = index == len(self._chunks) - 1
+            yield json.dumps({"response": chunk, "done": done})
+
+
+class FakeStreamClient:
+    """Answers per-page prompts with ``chunks`` and batched prompts (those
+    containing DOCUMENT labels) with ``batch_chunks``, which may also be an
+    exception to raise."""
+
+    def __init__(self, chunks, batch_chunks=None):
+        self._chunks = chunks
+        self._batch_chunks = batch_chunks
+        self.prompts = []
+        self.response = None
+
+    def stream(self, method, url, content=None, headers=None, timeout=None):
+        prompt = json.loads(content)["prompt"]
+        self.prompts.append(prompt)
+        chunks = self._chunks
+        if self._batch_chunks is not None and "DOCUMENT" in prompt:
+            chunks = self._batch_chunks
+        if isinstance(chunks, Exception):
+            raise chunks
+        self.response = FakeStreamResponse(chunks)
+        return self.response
+
+
+class FakeCache(dict):
+    def set(self, key, value, expire=None):
+        self[key] = value
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_batch_skips_short_content(monkeypatch):
+    async def fail_model_check():
+        raise AssertionError("model check should be skipped for short content")
+
+    monkeypatch.setattr(search_web_mcp, "ensure_model_available", fail_model_check)
+
+    (result,) = await search_web_mcp.extract_facts_batch(
+        ["Home  \n About \n Login"], "q"
+    )
+
+    assert result == {"facts": "", "facts_error": None}
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_batch_returns_cached_facts_without_ollama(monkeypatch):
+    cache = FakeCache()
+    cache[search_web_mcp.facts_cache_key(PAGE_CONTENT, "query")] = "cached facts"
+
+    async def fail_model_check():
+        raise AssertionError("model check should be skipped on cache hit")
+
+    monkeypatch.setattr(search_web_mcp, "get_facts_cache", lambda: cache)
+    monkeypatch.setattr(search_web_mcp, "ensure_model_available", fail_model_check)
+
+    (result,) = await search_web_mcp.extract_facts_batch([PAGE_CONTENT], "query")
+
+    assert result == {"facts": "cached facts", "facts_error": None}
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_batch_stores_ollama_response(monkeypatch):
+    cache = FakeCache()
+
+    monkeypatch.setattr(search_web_mcp, "get_facts_cache", lambda: cache)
+    monkeypatch.setattr(search_web_mcp, "ensure_model_available", fake_model_check)
+    monkeypatch.setattr(
+        search_web_mcp,
+        "get_client",
+        lambda: FakeStreamClient([" fresh", " facts ", ""]),
+    )
+
+    (result,) = await search_web_mcp.extract_facts_batch([PAGE_CONTENT], "query")
+
+    assert result == {"facts": "fresh facts", "facts_error": None}
+    assert cache == {
+        search_web_mcp.facts_cache_key(PAGE_CONTENT, "query"): "fresh facts"
+    }
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_batch_stops_streaming_at_token_limit(monkeypatch):
+    cache = FakeCache()
+    client = FakeStreamClient(["One fact.", " Another", " fact", " cut"] * 3)
+    monkeypatch.setattr(search_web_mcp, "get_facts_cache", lambda: cache)
+    monkeypatch.setattr(search_web_mcp, "ensure_model_available", fake_model_check)
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: client)
+    monkeypatch.setattr(search_web_mcp, "FACTS_MAX_TOKENS", 3)
+
+    (result,) = await search_web_mcp.extract_facts_batch([PAGE_CONTENT], "query")
+
+    assert result == {"facts": "One fact.", "facts_error": None}
+    assert client.response.lines_read == 3
+    assert cache == {}
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_batch_prompt_asks_for_length_cap(monkeypatch):
+    client = FakeStreamClient(["facts"])
+    monkeypatch.setattr(search_web_mcp, "ensure_model_available", fake_model_check)
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: client)
+
+    await search_web_mcp.extract_facts_batch([PAGE_CONTENT], "query")
+
+    assert f"under {search_web_mcp.FACTS_MAX_WORDS} words" in client.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_batch_keeps_markdown_structure_in_prompt(monkeypatch):
+    client = FakeStreamClient(["facts"])
+    page = "# Heading\n\n" + "\n".join(f"- item {i}" for i in range(40))
+    monkeypatch.setattr(search_web_mcp, "ensure_model_available", fake_model_check)
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: client)
+
+    await search_web_mcp.extract_facts_batch([page], "query")
+
+    assert client.prompts[0].endswith(page)
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_batch_splits_single_generation(monkeypatch):
+    cache = FakeCache()
+    client = FakeStreamClient(["facts one\n", "---\n", "not found"])
+    monkeypatch.setattr(search_web_mcp, "get_facts_cache", lambda: cache)
+    monkeypatch.setattr(search_web_mcp, "ensure_model_available", fake_model_check)
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: client)
+
+    result = await search_web_mcp.extract_facts_batch(
+        [PAGE_CONTENT, "", OTHER_PAGE_CONTENT], "query"
+    )
+
+    assert result == [
+        {"facts": "facts one", "facts_error": None},
+        {"facts": "", "facts_error": None},
+        {"facts": "not found", "facts_error": None},
+    ]
+    assert len(client.prompts) == 1
+    assert "DOCUMENT 2:" in client.prompts[0]
+    key = search_web_mcp.facts_cache_key(OTHER_PAGE_CONTENT, "query")
+    assert cache[key] == "not found"
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_batch_reports_error_when_batch_fails(monkeypatch):
+    client = FakeStreamClient(["single facts"], RuntimeError("batch timed out"))
+    monkeypatch.setattr(search_web_mcp, "ensure_model_available", fake_model_check)
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: client)
+
+    result = await search_web_mcp.extract_facts_batch(
+        [PAGE_CONTENT, OTHER_PAGE_CONTENT], "query"
+    )
+
+    assert result == [
+        {"facts": "", "facts_error": "batch timed out"},
+        {"facts": "", "facts_error": "batch timed out"},
+    ]
+    assert len(client.prompts) == 1
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_batch_sends_duplicate_pages_once(monkeypatch):
+    client = FakeStreamClient(["facts one\n", "---\n", "facts two"])
+    monkeypatch.setattr(search_web_mcp, "ensure_model_available", fake_model_check)
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: client)
+
+    result = await search_web_mcp.extract_facts_batch(
+        [PAGE_CONTENT, OTHER_PAGE_CONTENT, PAGE_CONTENT], "query"
+    )
+
+    assert [facts["facts"] for facts in result] == [
+        "facts one",
+        "facts two",
+        "facts one",
+    ]
+    assert len(client.prompts) == 1
+    assert "DOCUMENT 3:" not in client.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_extract_facts_batch_falls_back_when_answers_do_not_split(
+    monkeypatch,
+):
+    client = FakeStreamClient(["single facts"], ["one answer for everything"])
+    monkeypatch.setattr(search_web_mcp, "ensure_model_available", fake_model_check)
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: client)
+
+    result = await search_web_mcp.extract_facts_batch(
+        [PAGE_CONTENT, OTHER_PAGE_CONTENT], "query"
+    )
+
+    assert result == [
+        {"facts": "single facts", "facts_error": None},
+        {"facts": "single facts", "facts_error": None},
+    ]
+    assert len(client.prompts) == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_generate_limits_concurrent_generations(monkeypatch):
+    active = []
+    peak = []
+
+    class SlowResponse(FakeStreamResponse):
+        async def __aenter__(self):
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            active.pop()
+            return False
+
+    class SlowClient:
+        def stream(self, method, url, content=None, headers=None, timeout=None):
+            return SlowResponse(["facts"])
+
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: SlowClient())
+    monkeypatch.setattr(search_web_mcp, "_OLLAMA_SEMAPHORE", asyncio.Semaphore(2))
+
+    results = await asyncio.gather(
+        *(search_web_mcp.stream_generate("prompt", 10) for _ in range(5))
+    )
+
+    assert results == [("facts", True)] * 5
+    assert max(peak) == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_generate_times_out(monkeypatch):
+    class HangingResponse(FakeStreamResponse):
+        async def aiter_lines(self):
+            await asyncio.sleep(1)
+            yield ""
+
+    class HangingClient:
+        def stream(self, method, url, content=None, headers=None, timeout=None):
+            return HangingResponse([])
+
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: HangingClient())
+    monkeypatch.setattr(search_web_mcp, "OLLAMA_TIMEOUT", 0.01)
+
+    with pytest.raises(RuntimeError, match="timed out"):
+        await search_web_mcp.stream_generate("prompt", 10)
+
+
 @pytest.mark.asyncio
 async def test_search_web_uses_limit_and_returns_output(monkeypatch):
-    async def fake_facts(content, query):
-        if content:
-            return {"facts": "facts", "facts_error": None}
-        return {"facts": "", "facts_error": None}
+    async def fake_facts(contents, query):
+        return [
+            {"facts": "facts" if content else "", "facts_error": None}
+            for content in contents
+        ]
 
     async def fake_fetch(query, limit):
         assert limit == search_web_mcp.MAX_RESULTS
@@ -179,15 +550,17 @@ async def test_search_web_uses_limit_and_returns_output(monkeypatch):
             {"title": "Two", "url": "https://example.com/2", "snippet": "B"},
         ]
 
-    async def fake_crawl(urls):
-        return [
-            SimpleNamespace(markdown=SimpleNamespace(raw_markdown="m1")),
-            Exception("fail"),
-        ]
+    class PartlyFailingCrawler(FakeCrawler):
+        async def arun(self, url):
+            if url.endswith("/2"):
+                raise Exception("fail")
+            return SimpleNamespace(markdown=SimpleNamespace(raw_markdown="m1"))
 
     monkeypatch.setattr(search_web_mcp, "fetch_duckduckgo_results", fake_fetch)
-    monkeypatch.setattr(search_web_mcp, "crawl_urls", fake_crawl)
-    monkeypatch.setattr(search_web_mcp, "extract_facts", fake_facts)
+    monkeypatch.setattr(search_web_mcp, "extract_facts_batch", fake_facts)
+    monkeypatch.setattr(search_web_mcp, "AsyncWebCrawler", PartlyFailingCrawler)
+    monkeypatch.setattr(search_web_mcp, "_CRAWLER", None)
+    monkeypatch.setattr(search_web_mcp, "ensure_model_available", fake_model_check)
 
     result = await search_web_mcp.search_web("query", 10)
 
@@ -208,6 +581,90 @@ async def test_search_web_uses_limit_and_returns_output(monkeypatch):
     }
 
 
+@pytest.mark.asyncio
+async def test_get_crawler_is_shared_until_closed(monkeypatch):
+    monkeypatch.setattr(search_web_mcp, "AsyncWebCrawler", FakeCrawler)
+    monkeypatch.setattr(search_web_mcp, "_CRAWLER", None)
+    FakeCrawler.instances = 0
+
+    first, second = await asyncio.gather(
+        search_web_mcp.get_crawler(), search_web_mcp.get_crawler()
+    )
+
+    assert first is second
+    assert FakeCrawler.instances == 1
+
+    await search_web_mcp.close_crawler()
+
+    assert first.closed
+    assert search_web_mcp._CRAWLER is None
+
+
+@pytest.mark.asyncio
+async def test_get_crawler_closes_browser_when_start_is_cancelled(monkeypatch):
+    started = asyncio.Event()
+    crawlers = []
+
+    class SlowCrawler(FakeCrawler):
+        def __init__(self):
+            super().__init__()
+            crawlers.append(self)
+
+        async def start(self):
+            started.set()
+            await asyncio.sleep(1)
+            return self
+
+    monkeypatch.setattr(search_web_mcp, "AsyncWebCrawler", SlowCrawler)
+    monkeypatch.setattr(search_web_mcp, "_CRAWLER", None)
+
+    task = asyncio.create_task(search_web_mcp.get_crawler())
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0)
+
+    assert crawlers[0].closed
+    assert search_web_mcp._CRAWLER is None
+
+
+@pytest.mark.asyncio
+async def test_crawl_url_returns_exception_instead_of_raising():
+    class BrokenCrawler(FakeCrawler):
+        async def arun(self, url):
+            raise ValueError("boom")
+
+    result = await search_web_mcp.crawl_url(BrokenCrawler(), "https://example.com")
+
+    assert isinstance(result, ValueError)
+
+
+@pytest.mark.asyncio
+async def test_get_client_is_shared_until_closed():
+    client = search_web_mcp.get_client()
+
+    assert search_web_mcp.get_client() is client
+
+    await search_web_mcp.close_client()
+
+    assert search_web_mcp._CLIENT is None
+
+
+@pytest.mark.asyncio
+async def test_search_web_raises_fetch_error_unwrapped(monkeypatch):
+    async def failing_fetch(query, limit):
+        raise RuntimeError("rate limited")
+
+    monkeypatch.setattr(search_web_mcp, "fetch_duckduckgo_results", failing_fetch)
+    monkeypatch.setattr(search_web_mcp, "AsyncWebCrawler", FakeCrawler)
+    monkeypatch.setattr(search_web_mcp, "_CRAWLER", None)
+    monkeypatch.setattr(search_web_mcp, "ensure_model_available", fake_model_check)
+
+    with pytest.raises(RuntimeError, match="rate limited"):
+        await search_web_mcp.search_web("query", 3)
+
+
 def test_handle_request_missing_query():
     assert search_web_mcp.handle_request({}) == {"error": "Missing query"}
 
@@ -250,28 +707,22 @@ def test_main_reads_json_and_writes_response(monkeypatch, capsys):
 
 
 @pytest.mark.asyncio
-async def test_ensure_model_available_missing(monkeypatch):
+async def test_ensure_model_available_missing(monkeypatch, tmp_path):
     async def fake_get(*args, **kwargs):
         class Resp:
+            content = json.dumps({"models": [{"name": "other:latest"}]}).encode()
+
             def raise_for_status(self):
                 return None
 
-            def json(self):
-                return {"models": [{"name": "other:latest"}]}
-
         return Resp()
 
     class FakeClient:
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb):
-            return False
-
         get = staticmethod(fake_get)
 
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: FakeClient())
     monkeypatch.setattr(
-        search_web_mcp.httpx, "AsyncClient", lambda timeout=10: FakeClient()
+        search_web_mcp, "MODEL_CHECK_FILE", str(tmp_path / "model.json")
     )
     search_web_mcp._MODEL_CHECK.update(
         {"checked": False, "available": True, "error": None}
@@ -281,3 +732,76 @@ async def test_ensure_model_available_missing(monkeypatch):
 
     assert result["available"] is False
     assert "Model not found" in result["error"]
+    assert not (tmp_path / "model.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_ensure_model_available_persists_and_reuses_probe(
+    monkeypatch, tmp_path
+):
+    calls = []
+
+    async def fake_get(*args, **kwargs):
+        calls.append(args)
+
+        class Resp:
+            content = json.dumps(
+                {"models": [{"name": search_web_mcp.OLLAMA_MODEL}]}
+            ).encode()
+
+            def raise_for_status(self):
+                return None
+
+        return Resp()
+
+    class FakeClient:
+        get = staticmethod(fake_get)
+
+    monkeypatch.setattr(search_web_mcp, "get_client", lambda: FakeClient())
+    monkeypatch.setattr(
+        search_web_mcp, "MODEL_CHECK_FILE", str(tmp_path / "cache" / "model.json")
+    )
+    for _ in range(2):
+        search_web_mcp._MODEL_CHECK.update(
+            {"checked": False, "available": True, "error": None}
+        )
+        result = await search_web_mcp.ensure_model_available()
+        assert result["available"] is True
+
+    assert len(calls) == 1
+
+
+def test_load_model_check_ignores_malformed_timestamp(monkeypatch, tmp_path):
+    path = tmp_path / "model.json"
+    path.write_text(
+        json.dumps(
+            {
+                "ts": "yesterday",
+                "available": True,
+                "model": search_web_mcp.OLLAMA_MODEL,
+                "url": search_web_mcp.get_ollama_base_url(),
+            }
+        )
+    )
+    monkeypatch.setattr(search_web_mcp, "MODEL_CHECK_FILE", str(path))
+
+    assert search_web_mcp.load_model_check() is False
+
+
+def test_load_model_check_ignores_other_ollama_url(monkeypatch, tmp_path):
+    path = tmp_path / "model.json"
+    monkeypatch.setattr(search_web_mcp, "MODEL_CHECK_FILE", str(path))
+    monkeypatch.setattr(
+        search_web_mcp,
+        "_MODEL_CHECK",
+        {"checked": False, "available": True, "error": None},
+    )
+    search_web_mcp.save_model_check()
+
+    assert search_web_mcp.load_model_check() is True
+
+    monkeypatch.setattr(
+        search_web_mcp, "OLLAMA_URL", "http://gpu-box:11434/api/generate"
+    )
+
+    assert search_web_mcp.load_model_check() is False